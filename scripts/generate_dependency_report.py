@@ -3,7 +3,9 @@ import json
 import argparse
 import logging
 from pathlib import Path
-from process_all_directories import process_all_directories
+from process_all_directories import process_all_directories, process_library_directory
+from git_discovery import discover_git_repositories
+from incremental_scan import find_library_dirs, select_libraries_to_scan, restore_base_results
 
 # Configure logging
 logging.basicConfig(
@@ -45,6 +47,13 @@ def get_top_versions(osv_response, num_versions=3):
     
     return top_versions
 
+def get_sample_size(osv_response):
+    """Describe how many files an OSV response was based on, e.g. '512/50000'."""
+    sample_info = osv_response.get("sample_info")
+    if not sample_info:
+        return "N/A"
+    return f"{sample_info['sampled_files']}/{sample_info['total_files']}"
+
 def find_osv_response_files(root_dir):
     """Recursively find all OSV response files in the directory tree."""
     return list(Path(root_dir).rglob("*_osv_response.json"))
@@ -119,7 +128,7 @@ def find_third_party_dirs(root_dir):
     
     return third_party_dirs
 
-def process_third_party_dirs(root_dir, debug=False):
+def process_third_party_dirs(root_dir, debug=False, adaptive=False):
     """Process all found third-party directories."""
     third_party_dirs = find_third_party_dirs(root_dir)
     
@@ -129,11 +138,83 @@ def process_third_party_dirs(root_dir, debug=False):
     
     logger.info(f"Found {len(third_party_dirs)} third-party directories to process")
     
+    # Map repositories and submodules once for all third-party directories
+    discovery = discover_git_repositories(root_dir)
+    
     for dir_path in third_party_dirs:
         logger.info(f"\nProcessing third-party directory: {dir_path}")
-        process_all_directories(dir_path, debug)
+        process_all_directories(dir_path, debug, adaptive, discovery)
+
+def process_changed_directories(root_dir, base_ref, base_artifacts_dir, auto_detect=False,
+                                debug=False, adaptive=False):
+    """Rescan only the library directories changed since base_ref.
+    
+    Results for the remaining libraries are restored from the base commit's
+    stored artifacts so the report and conanfile stay complete. Returns False
+    if a full scan is needed instead.
+    """
+    parent_dirs = find_third_party_dirs(root_dir) if auto_detect else [root_dir]
+    library_dirs = find_library_dirs(parent_dirs)
+    if not library_dirs:
+        return False
+    
+    selection = select_libraries_to_scan(root_dir, library_dirs, base_ref, base_artifacts_dir)
+    if selection is None:
+        logger.warning(f"Could not determine changes since {base_ref}, falling back to a full scan")
+        return False
+    
+    rescan_dirs, reuse_dirs = selection
+    restore_base_results(root_dir, reuse_dirs, base_artifacts_dir)
+    discovery = discover_git_repositories(root_dir)
+    for library_dir in rescan_dirs:
+        process_library_directory(library_dir, debug, adaptive, discovery)
+    return True
 
-def generate_markdown_report(root_dir, output_file="dependency_report.md"):
+def collect_library_versions(root_dir):
+    """Map each detected (library, source) pair in the tree to its version string."""
+    versions = {}
+    
+    for osv_file in find_osv_response_files(root_dir):
+        try:
+            with open(osv_file, 'r') as f:
+                osv_response = json.load(f)
+            top_versions = get_top_versions(osv_response, num_versions=1)
+            if top_versions:
+                library = os.path.relpath(os.path.dirname(osv_file), root_dir)
+                versions[(library, "OSV API")] = top_versions[0]['version']
+        except Exception as e:
+            logger.error(f"Error processing {osv_file}: {str(e)}")
+    
+    for git_file in find_git_info_files(root_dir):
+        try:
+            with open(git_file, 'r') as f:
+                git_info = json.load(f)
+            library_dir = os.path.relpath(os.path.dirname(git_file), root_dir)
+            for submodule in git_info["submodules"]:
+                library = os.path.normpath(os.path.join(library_dir, submodule['path']))
+                tag = submodule['tag']
+                versions[(library, "Git submodule")] = tag if tag != "No tag found" else submodule['commit'][:8]
+        except Exception as e:
+            logger.error(f"Error processing {git_file}: {str(e)}")
+    
+    return versions
+
+def compare_library_versions(base_versions, current_versions):
+    """List the libraries whose detected version differs between two scans."""
+    version_changes = []
+    for library, source in sorted(set(base_versions) | set(current_versions)):
+        base_version = base_versions.get((library, source), "-")
+        current_version = current_versions.get((library, source), "-")
+        if base_version != current_version:
+            version_changes.append({
+                "library": library,
+                "source": source,
+                "base_version": base_version,
+                "current_version": current_version
+            })
+    return version_changes
+
+def generate_markdown_report(root_dir, output_file="dependency_report.md", version_changes=None, base_ref=None):
     """Generate a markdown report of dependencies and their versions."""
     osv_files = find_osv_response_files(root_dir)
     failed_libraries = find_failed_libraries(root_dir)
@@ -158,8 +239,8 @@ def generate_markdown_report(root_dir, output_file="dependency_report.md"):
     # Add successful libraries section (from OSV API)
     if osv_files:
         markdown.append("## Successfully Processed Libraries (OSV API)\n")
-        markdown.append("| Library | Version | Score | Repository | Tag | File Matches | Different Files |")
-        markdown.append("|---------|---------|-------|------------|-----|--------------|-----------------|")
+        markdown.append("| Library | Version | Score | Repository | Tag | File Matches | Different Files | Files Sampled |")
+        markdown.append("|---------|---------|-------|------------|-----|--------------|-----------------|---------------|")
         
         for osv_file in osv_files:
             try:
@@ -169,12 +250,13 @@ def generate_markdown_report(root_dir, output_file="dependency_report.md"):
                 # Get library name from the directory path
                 library_name = get_library_name(osv_file)
                 top_versions = get_top_versions(osv_response)
+                sample_size = get_sample_size(osv_response)
                 
                 for version in top_versions:
                     markdown.append(
                         f"| {library_name} | {version['version']} | {version['score']} | "
                         f"{version['repository']} | {version['tag']} | {version['file_matches']} | "
-                        f"{version['diff_files']} |"
+                        f"{version['diff_files']} | {sample_size} |"
                     )
             except Exception as e:
                 logger.error(f"Error processing {osv_file}: {str(e)}")
@@ -236,6 +318,20 @@ def generate_markdown_report(root_dir, output_file="dependency_report.md"):
         for lib in failed_libraries:
             markdown.append(f"| {lib['name']} | {lib['path']} |")
     
+    # Add version changes section when comparing against a base commit
+    if version_changes is not None:
+        markdown.append(f"\n## Version Changes Since {base_ref}\n")
+        if version_changes:
+            markdown.append("| Library | Source | Base Version | Current Version |")
+            markdown.append("|---------|--------|--------------|-----------------|")
+            for change in version_changes:
+                markdown.append(
+                    f"| {change['library']} | {change['source']} | "
+                    f"{change['base_version']} | {change['current_version']} |"
+                )
+        else:
+            markdown.append("No version changes detected.")
+    
     # Print report to console
     logger.info("\nDependency Report:")
     logger.info("=" * 80)
@@ -293,23 +389,40 @@ def main():
                        default='INFO', help='Set the logging level')
     parser.add_argument('--auto-detect', action='store_true', 
                        help='Automatically detect and process third-party directories')
+    parser.add_argument('--adaptive', action='store_true',
+                       help='Hash a growing sample of files per library and stop once the top match is confident')
+    parser.add_argument('--since', metavar='BASE_REF',
+                       help='Only rescan library directories changed between BASE_REF and HEAD')
+    parser.add_argument('--base-artifacts',
+                       help="Directory holding the base commit's stored result files (required with --since)")
     args = parser.parse_args()
     
+    if args.since and not args.base_artifacts:
+        parser.error('--since requires --base-artifacts')
+    
     # Set logging level
     logger.setLevel(getattr(logging, args.log_level))
     
-    if args.auto_detect:
+    if args.since and process_changed_directories(args.root_dir, args.since, args.base_artifacts,
+                                                  args.auto_detect, args.debug, args.adaptive):
+        logger.info(f"Processed directories changed since {args.since}")
+    elif args.auto_detect:
         # Process all detected third-party directories
         logger.info("Auto-detecting third-party directories...")
-        process_third_party_dirs(args.root_dir, args.debug)
+        process_third_party_dirs(args.root_dir, args.debug, args.adaptive)
     else:
         # Process the specified directory
         logger.info(f"Processing directory: {args.root_dir}")
-        process_all_directories(args.root_dir, args.debug)
+        process_all_directories(args.root_dir, args.debug, args.adaptive)
     
     # Generate the report and conanfile
+    version_changes = None
+    if args.since:
+        version_changes = compare_library_versions(collect_library_versions(args.base_artifacts),
+                                                   collect_library_versions(args.root_dir))
+    
     logger.info("Generating dependency report...")
-    generate_markdown_report(args.root_dir, args.output)
+    generate_markdown_report(args.root_dir, args.output, version_changes, args.since)
     generate_conanfile(args.root_dir)
 
 if __name__ == "__main__":
@@ -0,0 +1,320 @@
+import os
+import struct
+import subprocess
+import json
+import argparse
+import logging
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+GITLINK_MODE = 0o160000
+
+def find_worktree_root(directory):
+    """Find the closest enclosing directory that has a .git entry, without running git."""
+    current = os.path.abspath(directory)
+    while True:
+        if os.path.exists(os.path.join(current, '.git')):
+            return current
+        parent = os.path.dirname(current)
+        if parent == current:
+            return None
+        current = parent
+
+def resolve_git_dir(worktree):
+    """Resolve the Git directory of a worktree, following 'gitdir:' files used by submodules."""
+    dot_git = os.path.join(worktree, '.git')
+    if os.path.isdir(dot_git):
+        return dot_git
+    try:
+        with open(dot_git, 'r') as f:
+            content = f.read().strip()
+    except OSError:
+        return None
+    if not content.startswith('gitdir:'):
+        return None
+    git_dir = content[len('gitdir:'):].strip()
+    return os.path.normpath(os.path.join(worktree, git_dir))
+
+def get_common_dir(git_dir):
+    """Return the directory holding shared files such as config (differs for linked worktrees)."""
+    commondir_file = os.path.join(git_dir, 'commondir')
+    if os.path.exists(commondir_file):
+        with open(commondir_file, 'r') as f:
+            return os.path.normpath(os.path.join(git_dir, f.read().strip()))
+    return git_dir
+
+def find_superproject_root(directory):
+    """Find the outermost superproject worktree containing directory.
+
+    Starts at the closest .git entry and keeps walking up while that
+    worktree is a submodule, i.e. its .git file points into a parent
+    repository's modules directory.
+    """
+    worktree = find_worktree_root(directory)
+    while worktree is not None:
+        git_dir = resolve_git_dir(worktree)
+        parent = find_worktree_root(os.path.dirname(worktree))
+        if git_dir is None or parent is None or os.path.isdir(os.path.join(worktree, '.git')):
+            return worktree
+        parent_git_dir = resolve_git_dir(parent)
+        if parent_git_dir is None:
+            return worktree
+        modules_dir = os.path.join(get_common_dir(parent_git_dir), 'modules')
+        if not git_dir.startswith(modules_dir + os.sep):
+            return worktree
+        worktree = parent
+    return None
+
+def parse_git_config(config_file):
+    """Parse a Git config style file (.git/config, .gitmodules) into a dict of sections.
+
+    Section keys are tuples such as ('submodule', 'name') or ('core', None);
+    values are dicts of lowercase keys to their last value.
+    """
+    sections = {}
+    current = None
+    try:
+        with open(config_file, 'r') as f:
+            lines = f.readlines()
+    except OSError:
+        return sections
+
+    for raw_line in lines:
+        line = raw_line.strip()
+        if not line or line[0] in '#;':
+            continue
+        if line.startswith('[') and ']' in line:
+            header = line[1:line.index(']')].strip()
+            if '"' in header:
+                section, _, subsection = header.partition('"')
+                key = (section.strip().lower(), subsection.rstrip('"'))
+            else:
+                key = (header.lower(), None)
+            current = sections.setdefault(key, {})
+            continue
+        if current is None:
+            continue
+        name, _, value = line.partition('=')
+        value = value.strip()
+        if len(value) >= 2 and value[0] == value[-1] == '"':
+            value = value[1:-1]
+        current[name.strip().lower()] = value
+    return sections
+
+def read_varint(data, offset):
+    """Read an offset-encoded varint as used by index version 4 path compression."""
+    byte = data[offset]
+    offset += 1
+    value = byte & 0x7f
+    while byte & 0x80:
+        byte = data[offset]
+        offset += 1
+        value = ((value + 1) << 7) | (byte & 0x7f)
+    return value, offset
+
+def read_index_gitlinks(git_dir):
+    """Read gitlink (submodule) entries straight from a Git index file.
+
+    Returns a dict mapping worktree-relative paths to commit hashes, or None
+    if the index could not be parsed.
+    """
+    index_file = os.path.join(git_dir, 'index')
+    try:
+        with open(index_file, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return {}
+
+    try:
+        signature, version, count = struct.unpack('>4sII', data[:12])
+        if signature != b'DIRC' or version not in (2, 3, 4):
+            logger.warning(f"Unsupported index format in {index_file}")
+            return None
+
+        gitlinks = {}
+        offset = 12
+        previous_path = b''
+        for _ in range(count):
+            entry_start = offset
+            mode = struct.unpack('>I', data[offset + 24:offset + 28])[0]
+            sha = data[offset + 40:offset + 60].hex()
+            flags = struct.unpack('>H', data[offset + 60:offset + 62])[0]
+            offset += 62
+            if version >= 3 and flags & 0x4000:
+                # Extended flags
+                offset += 2
+
+            if version == 4:
+                strip, offset = read_varint(data, offset)
+                end = data.index(b'\0', offset)
+                path = previous_path[:len(previous_path) - strip] + data[offset:end]
+                offset = end + 1
+            else:
+                end = data.index(b'\0', offset)
+                path = data[offset:end]
+                # Entries are NUL padded to a multiple of 8 bytes
+                offset = entry_start + ((end - entry_start + 8) & ~7)
+            previous_path = path
+
+            if mode == GITLINK_MODE:
+                gitlinks[path.decode('utf-8', errors='surrogateescape')] = sha
+
+        # Extensions follow the entries, before the trailing 20-byte checksum.
+        # A split index keeps entries in a shared index and a sparse index
+        # collapses directories, so the entries alone are incomplete.
+        while offset + 8 <= len(data) - 20:
+            extension, size = struct.unpack('>4sI', data[offset:offset + 8])
+            if extension in (b'link', b'sdir'):
+                logger.info(f"Index {index_file} uses the '{extension.decode()}' extension, falling back to git")
+                return None
+            offset += 8 + size
+        return gitlinks
+    except (struct.error, ValueError, IndexError) as e:
+        logger.warning(f"Could not parse index {index_file}: {str(e)}")
+        return None
+
+def list_gitlinks_with_git(worktree):
+    """Fallback for indexes that cannot be parsed directly: one 'git ls-files' per repository."""
+    try:
+        result = subprocess.run(
+            ['git', 'ls-files', '--stage'],
+            cwd=worktree,
+            capture_output=True,
+            text=True
+        )
+    except Exception as e:
+        logger.error(f"Error listing gitlinks in {worktree}: {str(e)}")
+        return {}
+    if result.returncode != 0:
+        return {}
+
+    gitlinks = {}
+    for line in result.stdout.splitlines():
+        meta, _, path = line.partition('\t')
+        parts = meta.split()
+        if len(parts) >= 2 and parts[0] == '160000':
+            gitlinks[path] = parts[1]
+    return gitlinks
+
+def discover_repository(worktree, repositories, submodules, parent=None):
+    """Record a repository and recurse into its initialized submodules."""
+    git_dir = resolve_git_dir(worktree)
+    if git_dir is None:
+        return
+    config = parse_git_config(os.path.join(get_common_dir(git_dir), 'config'))
+    repositories[worktree] = {
+        "git_dir": git_dir,
+        "remote_url": config.get(('remote', 'origin'), {}).get('url'),
+        "parent": parent
+    }
+
+    gitlinks = read_index_gitlinks(git_dir)
+    if gitlinks is None:
+        gitlinks = list_gitlinks_with_git(worktree)
+
+    gitmodules = parse_git_config(os.path.join(worktree, '.gitmodules'))
+    modules_by_path = {
+        values.get('path'): (name, values)
+        for (section, name), values in gitmodules.items()
+        if section == 'submodule' and values.get('path')
+    }
+
+    for path, commit in sorted(gitlinks.items()):
+        name, module = modules_by_path.get(path, (path, {}))
+        submodule_worktree = os.path.normpath(os.path.join(worktree, path))
+        submodules.append({
+            "name": name,
+            "path": submodule_worktree,
+            "commit": commit,
+            "url": module.get('url'),
+            "superproject": worktree
+        })
+        if os.path.exists(os.path.join(submodule_worktree, '.git')):
+            discover_repository(submodule_worktree, repositories, submodules, worktree)
+
+def discover_git_repositories(root_dir):
+    """Map out the superproject containing root_dir and all of its submodules, recursively.
+
+    Reads .gitmodules, config and index files directly so that no git process
+    is needed per library directory.
+    """
+    repositories = {}
+    submodules = []
+    worktree = find_superproject_root(root_dir)
+    if worktree is None:
+        logger.info(f"No Git repository found for {root_dir}")
+    else:
+        discover_repository(worktree, repositories, submodules)
+        logger.info(f"Discovered {len(repositories)} repositories and {len(submodules)} submodules under {worktree}")
+    return {
+        "repositories": repositories,
+        "submodules": submodules
+    }
+
+def discover_unlisted_repository(discovery, directory):
+    """Add the repository closest to directory if the map does not know it yet.
+
+    Covers repositories that are not reachable through gitlinks, such as a
+    vendored library that is its own standalone clone. Costs a stat per
+    parent directory, not a git process.
+    """
+    worktree = find_worktree_root(directory)
+    if worktree is None or worktree in discovery["repositories"]:
+        return
+    parent = None
+    known = [w for w in discovery["repositories"] if worktree.startswith(w + os.sep)]
+    if known:
+        parent = max(known, key=len)
+    logger.info(f"Found repository outside the submodule tree: {worktree}")
+    discover_repository(worktree, discovery["repositories"], discovery["submodules"], parent)
+
+def find_repository(discovery, directory):
+    """Return the worktree of the innermost repository containing directory."""
+    directory = os.path.abspath(directory)
+    discover_unlisted_repository(discovery, directory)
+    matches = [
+        worktree for worktree in discovery["repositories"]
+        if directory == worktree or directory.startswith(worktree + os.sep)
+    ]
+    return max(matches, key=len) if matches else None
+
+def find_submodules(discovery, directory):
+    """List the submodules at or below directory, with paths relative to it.
+
+    The remote URL comes from the submodule's own config when it has been
+    initialized, and from .gitmodules otherwise.
+    """
+    directory = os.path.abspath(directory)
+    discover_unlisted_repository(discovery, directory)
+    found = []
+    for submodule in discovery["submodules"]:
+        path = submodule["path"]
+        if path != directory and not path.startswith(directory + os.sep):
+            continue
+        repository = discovery["repositories"].get(path, {})
+        found.append({
+            "path": os.path.relpath(path, directory),
+            "commit": submodule["commit"],
+            "repository": repository.get("remote_url") or submodule["url"]
+        })
+    return found
+
+def main():
+    parser = argparse.ArgumentParser(description='Discover Git repositories and submodules without running git per directory.')
+    parser.add_argument('root_dir', help='Directory inside the superproject to discover from')
+    parser.add_argument('--log-level', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                       default='INFO', help='Set the logging level')
+    args = parser.parse_args()
+
+    # Set logging level
+    logger.setLevel(getattr(logging, args.log_level))
+
+    print(json.dumps(discover_git_repositories(args.root_dir), indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ import json
 import logging
 from pathlib import Path
 import argparse
+from git_discovery import discover_git_repositories, find_repository, find_submodules
 
 # Configure logging
 logging.basicConfig(
@@ -12,54 +13,6 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def get_git_submodule_info(directory):
-    """Get information about Git submodules in the given directory."""
-    logger.info(f"Starting get_git_submodule_info for {directory}")
-    logger.info(f"Current logging level: {logger.getEffectiveLevel()}")
-    
-    try:
-        # Get submodule information
-        result = subprocess.run(
-            ['git', 'submodule', 'status'],
-            cwd=directory,
-            capture_output=True,
-            text=True
-        )
-        
-        # Log the raw output for debugging
-        logger.info(f"Git submodule status output for {directory}:")
-        logger.info(f"Return code: {result.returncode}")
-        logger.info(f"Stdout: {result.stdout}")
-        logger.info(f"Stderr: {result.stderr}")
-        
-        if result.returncode != 0:
-            logger.info(f"Git submodule status failed with return code {result.returncode}")
-            return None
-
-        submodules = []
-        for line in result.stdout.splitlines():
-            parts = line.strip().split()
-            if len(parts) >= 2:
-                commit_hash = parts[0].lstrip('-+')
-                path = parts[1]
-                submodules.append({
-                    'path': path,
-                    'commit': commit_hash
-                })
-                logger.info(f"Found submodule: path={path}, commit={commit_hash}")
-            else:
-                logger.info(f"Skipping malformed line: {line}")
-
-        if not submodules:
-            logger.info(f"No submodules found in {directory}")
-        else:
-            logger.info(f"Found {len(submodules)} submodules in {directory}")
-
-        return submodules
-    except Exception as e:
-        logger.error(f"Error getting Git submodule info for {directory}: {str(e)}")
-        return None
-
 def get_git_tag_from_commit(directory, commit_hash):
     """Get the Git tag associated with a commit hash."""
     try:
@@ -76,22 +29,6 @@ def get_git_tag_from_commit(directory, commit_hash):
         logger.error(f"Error getting Git tag for commit {commit_hash}: {str(e)}")
         return None
 
-def get_git_remote_url(directory):
-    """Get the remote URL of a Git repository."""
-    try:
-        result = subprocess.run(
-            ['git', 'remote', 'get-url', 'origin'],
-            cwd=directory,
-            capture_output=True,
-            text=True
-        )
-        if result.returncode == 0:
-            return result.stdout.strip()
-        return None
-    except Exception as e:
-        logger.error(f"Error getting Git remote URL for {directory}: {str(e)}")
-        return None
-
 def get_git_commit_info(directory, commit_hash):
     """Get detailed information about a Git commit."""
     try:
@@ -114,8 +51,13 @@ def get_git_commit_info(directory, commit_hash):
         logger.error(f"Error getting commit info for {commit_hash}: {str(e)}")
         return None
 
-def process_directory_with_git(root_dir, debug=False):
-    """Process a directory to find library versions using Git submodule information."""
+def process_directory_with_git(root_dir, debug=False, discovery=None):
+    """Process a directory to find library versions using Git submodule information.
+    
+    Repository and submodule lookups come from the discovery map built by
+    discover_git_repositories(); pass one in to share it across directories.
+    Git is only run for the tag and commit author of each submodule.
+    """
     if not os.path.isdir(root_dir):
         logger.error(f"Error: {root_dir} is not a valid directory")
         return None
@@ -125,18 +67,11 @@ def process_directory_with_git(root_dir, debug=False):
     logger.info(f"\nProcessing library with Git: {name}")
     logger.info(f"Target directory: {os.path.abspath(root_dir)}")
     
+    if discovery is None:
+        discovery = discover_git_repositories(root_dir)
+    
     # Check if directory is a Git repository
-    try:
-        result = subprocess.run(
-            ['git', 'rev-parse', '--is-inside-work-tree'],
-            cwd=root_dir,
-            capture_output=True,
-            text=True
-        )
-        is_git_repo = result.returncode == 0
-    except Exception as e:
-        logger.error(f"Error checking Git repository status: {str(e)}")
-        is_git_repo = False
+    is_git_repo = find_repository(discovery, root_dir) is not None
     
     if not is_git_repo:
         # Save information about non-Git repository
@@ -152,7 +87,7 @@ def process_directory_with_git(root_dir, debug=False):
         return no_git_info
     
     # Get Git submodule information
-    submodules = get_git_submodule_info(root_dir)
+    submodules = find_submodules(discovery, root_dir)
     if not submodules:
         # Save information about repository with no submodules
         no_submodules_info = {
@@ -183,7 +118,7 @@ def process_directory_with_git(root_dir, debug=False):
         submodule_path = os.path.join(root_dir, submodule['path'])
         if os.path.isdir(submodule_path):
             tag = get_git_tag_from_commit(submodule_path, submodule['commit'])
-            remote_url = get_git_remote_url(submodule_path)
+            remote_url = submodule['repository']
             commit_info = get_git_commit_info(submodule_path, submodule['commit'])
             
             submodule_info = {
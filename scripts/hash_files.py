@@ -14,6 +14,14 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+SOURCE_EXTENSIONS = {'.c', '.cc', '.h', '.hh', '.cpp', '.hpp'}
+
+# Adaptive sampling defaults: start small and double the sample until the
+# top OSV match is confident enough or every file has been hashed.
+DEFAULT_INITIAL_SAMPLE = 256
+DEFAULT_CONFIDENCE_SCORE = 0.9
+DEFAULT_MIN_FILE_MATCHES = 50
+
 def calculate_md5_hash(file_path):
     """Calculate MD5 hash of a file and return it as base64 encoded bytes."""
     hash_md5 = hashlib.md5()
@@ -22,26 +30,35 @@ def calculate_md5_hash(file_path):
             hash_md5.update(chunk)
     return base64.b64encode(hash_md5.digest()).decode('utf-8')
 
-def find_and_hash_files(root_dir, name, debug=False):
-    """Walk through directories and find C/C++ files to hash."""
-    file_hashes = []
-    extensions = {'.c', '.cc', '.h', '.hh', '.cpp', '.hpp'}
-    
+def find_source_files(root_dir):
+    """Walk through directories and return the relative paths of C/C++ files."""
+    source_files = []
     for root, _, files in os.walk(root_dir):
         for file in files:
-            if Path(file).suffix in extensions:
-                file_path = os.path.join(root, file)
-                relative_path = os.path.relpath(file_path, root_dir)
-                try:
-                    file_hash = calculate_md5_hash(file_path)
-                    file_hashes.append({
-                        "hash": file_hash,
-                        "file_path": relative_path
-                    })
-                    if debug:
-                        logger.debug(f"Processed file: {relative_path}")
-                except Exception as e:
-                    logger.error(f"Error processing {file_path}: {str(e)}")
+            if Path(file).suffix in SOURCE_EXTENSIONS:
+                source_files.append(os.path.relpath(os.path.join(root, file), root_dir))
+    return sorted(source_files)
+
+def hash_source_files(root_dir, relative_paths, debug=False):
+    """Hash the given files (relative to root_dir) into OSV file_hashes entries."""
+    file_hashes = []
+    for relative_path in relative_paths:
+        file_path = os.path.join(root_dir, relative_path)
+        try:
+            file_hash = calculate_md5_hash(file_path)
+            file_hashes.append({
+                "hash": file_hash,
+                "file_path": relative_path
+            })
+            if debug:
+                logger.debug(f"Processed file: {relative_path}")
+        except Exception as e:
+            logger.error(f"Error processing {file_path}: {str(e)}")
+    return file_hashes
+
+def find_and_hash_files(root_dir, name, debug=False):
+    """Walk through directories and find C/C++ files to hash."""
+    file_hashes = hash_source_files(root_dir, find_source_files(root_dir), debug)
     
     if debug:
         logger.debug(f"Total files processed: {len(file_hashes)}")
@@ -51,6 +68,47 @@ def find_and_hash_files(root_dir, name, debug=False):
         "file_hashes": file_hashes
     }
 
+def stratified_sample_order(relative_paths):
+    """Order files so that any prefix is a deterministic, stratified sample.
+    
+    Files are grouped by their top-level directory, shuffled within each group
+    using a hash of the path, and then interleaved round-robin across groups.
+    Taking the first N entries therefore covers every part of the library and
+    always yields the same files for the same tree, and each larger sample
+    contains the smaller ones.
+    """
+    strata = {}
+    for relative_path in relative_paths:
+        parts = Path(relative_path).parts
+        stratum = parts[0] if len(parts) > 1 else ''
+        strata.setdefault(stratum, []).append(relative_path)
+    
+    queues = [
+        sorted(paths, key=lambda p: hashlib.md5(p.encode('utf-8')).hexdigest())
+        for _, paths in sorted(strata.items())
+    ]
+    
+    ordered = []
+    index = 0
+    while len(ordered) < len(relative_paths):
+        for queue in queues:
+            if index < len(queue):
+                ordered.append(queue[index])
+        index += 1
+    return ordered
+
+def is_confident_match(osv_response, sample_size, min_score, min_file_matches):
+    """Check whether the top OSV match is strong enough to stop sampling."""
+    matches = osv_response.get("matches", [])
+    if not matches:
+        return False
+    # int64 fields such as minimum_file_matches arrive as JSON strings
+    top_match = max(matches, key=lambda x: float(x.get("score") or 0))
+    # A small sample can never reach an absolute file count, so cap it
+    required_matches = min(min_file_matches, sample_size)
+    return (float(top_match.get("score") or 0) >= min_score and
+            int(top_match.get("minimum_file_matches") or 0) >= required_matches)
+
 def query_osv_api(file_hashes_data, debug=False):
     """Query the OSV API determineversion endpoint with the file hashes data."""
     url = "https://api.osv.dev/v1experimental/determineversion"
@@ -74,8 +132,52 @@ def query_osv_api(file_hashes_data, debug=False):
         logger.error(f"Error querying OSV API: {str(e)}")
         return None
 
-def process_directory(root_dir, debug=False):
-    """Process a directory to find and hash C/C++ files, then query OSV API."""
+def query_osv_api_adaptive(root_dir, name, debug=False,
+                           initial_sample=DEFAULT_INITIAL_SAMPLE,
+                           min_score=DEFAULT_CONFIDENCE_SCORE,
+                           min_file_matches=DEFAULT_MIN_FILE_MATCHES):
+    """Query the OSV API with a growing sample of file hashes.
+    
+    Returns a tuple of (osv_response, file_hashes_data, sample_size,
+    total_files). Hashes computed for a smaller sample are reused when the
+    sample is widened.
+    """
+    ordered_files = stratified_sample_order(find_source_files(root_dir))
+    total_files = len(ordered_files)
+    file_hashes = []
+    hashed_files = 0
+    sample_size = min(max(initial_sample, 1), total_files)
+    osv_response = None
+    
+    while True:
+        file_hashes.extend(hash_source_files(root_dir, ordered_files[hashed_files:sample_size], debug))
+        hashed_files = sample_size
+        file_hashes_data = {
+            "name": name,
+            "file_hashes": file_hashes
+        }
+        logger.info(f"Querying OSV API with {sample_size} of {total_files} files")
+        osv_response = query_osv_api(file_hashes_data, debug)
+        
+        if osv_response is None or sample_size >= total_files:
+            break
+        if is_confident_match(osv_response, sample_size, min_score, min_file_matches):
+            logger.info(f"Confident match found after sampling {sample_size} of {total_files} files")
+            break
+        sample_size = min(sample_size * 2, total_files)
+    
+    return osv_response, file_hashes_data, sample_size, total_files
+
+def process_directory(root_dir, debug=False, adaptive=False,
+                      initial_sample=DEFAULT_INITIAL_SAMPLE,
+                      min_score=DEFAULT_CONFIDENCE_SCORE,
+                      min_file_matches=DEFAULT_MIN_FILE_MATCHES):
+    """Process a directory to find and hash C/C++ files, then query OSV API.
+    
+    With adaptive=True, only a stratified sample of files is hashed at first
+    and the sample is widened until the top match passes the confidence
+    thresholds.
+    """
     if not os.path.isdir(root_dir):
         logger.error(f"Error: {root_dir} is not a valid directory")
         return None
@@ -85,8 +187,13 @@ def process_directory(root_dir, debug=False):
     logger.info(f"Processing library: {name}")
     logger.info(f"Target directory: {os.path.abspath(root_dir)}")
     
-    # Generate file hashes
-    file_hashes_data = find_and_hash_files(root_dir, name, debug)
+    if adaptive:
+        osv_response, file_hashes_data, sample_size, total_files = query_osv_api_adaptive(
+            root_dir, name, debug, initial_sample, min_score, min_file_matches)
+    else:
+        file_hashes_data = find_and_hash_files(root_dir, name, debug)
+        osv_response = query_osv_api(file_hashes_data, debug)
+        sample_size = total_files = len(file_hashes_data["file_hashes"])
     
     if debug:
         # Save file hashes to JSON in the target directory
@@ -96,9 +203,14 @@ def process_directory(root_dir, debug=False):
             json.dump(file_hashes_data, f, indent=2)
         logger.info(f"File hashes saved to: {hashes_file_abs}")
     
-    # Query OSV API
-    osv_response = query_osv_api(file_hashes_data, debug)
     if osv_response:
+        # Record how many files the result is based on
+        osv_response["sample_info"] = {
+            "adaptive": adaptive,
+            "sampled_files": sample_size,
+            "total_files": total_files
+        }
+        
         # Always save OSV API response to JSON in the target directory
         osv_file = os.path.join(root_dir, f"{name}_osv_response.json")
         osv_file_abs = os.path.abspath(osv_file)
@@ -127,12 +239,21 @@ def main():
     parser.add_argument('--debug', action='store_true', help='Enable debug mode (saves hashes and responses to JSON files)')
     parser.add_argument('--log-level', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'], 
                        default='INFO', help='Set the logging level')
+    parser.add_argument('--adaptive', action='store_true',
+                       help='Hash a growing sample of files and stop once the top match is confident')
+    parser.add_argument('--initial-sample', type=int, default=DEFAULT_INITIAL_SAMPLE,
+                       help='Number of files in the first adaptive sample')
+    parser.add_argument('--confidence-score', type=float, default=DEFAULT_CONFIDENCE_SCORE,
+                       help='Minimum top match score to stop adaptive sampling')
+    parser.add_argument('--min-file-matches', type=int, default=DEFAULT_MIN_FILE_MATCHES,
+                       help='Minimum file matches of the top match to stop adaptive sampling')
     args = parser.parse_args()
     
     # Set logging level
     logger.setLevel(getattr(logging, args.log_level))
     
-    process_directory(args.root_dir, args.debug)
+    process_directory(args.root_dir, args.debug, args.adaptive, args.initial_sample,
+                      args.confidence_score, args.min_file_matches)
 
 if __name__ == "__main__":
     main() 
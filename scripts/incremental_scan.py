@@ -0,0 +1,165 @@
+import os
+import shutil
+import subprocess
+import argparse
+import logging
+from pathlib import Path
+from hash_files import SOURCE_EXTENSIONS
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Per-library result files written by hash_files.py and git_submodule_version.py
+RESULT_FILE_SUFFIXES = [
+    '_osv_response.json',
+    '_git_info.json',
+    '_no_git_info.json',
+    '_no_submodules_info.json'
+]
+
+GITLINK_MODE = '160000'
+
+def get_changed_paths(root_dir, base_ref):
+    """Get the paths changed between base_ref and HEAD, relative to root_dir.
+
+    Returns a list of paths, or None if the diff could not be computed. A
+    submodule bump shows up as its gitlink path, which is an ancestor of the
+    library directories inside that submodule.
+    """
+    try:
+        result = subprocess.run(
+            ['git', 'diff', '--raw', '--relative', '--no-renames', base_ref, 'HEAD'],
+            cwd=root_dir,
+            capture_output=True,
+            text=True
+        )
+    except Exception as e:
+        logger.error(f"Error running git diff against {base_ref}: {str(e)}")
+        return None
+
+    if result.returncode != 0:
+        logger.error(f"git diff against {base_ref} failed: {result.stderr.strip()}")
+        return None
+
+    changed_paths = []
+    for line in result.stdout.splitlines():
+        # Format: ":<old mode> <new mode> <old sha> <new sha> <status>\t<path>"
+        if not line.startswith(':') or '\t' not in line:
+            continue
+        meta, path = line.split('\t', 1)
+        old_mode, new_mode = meta[1:].split()[:2]
+        changed_paths.append(path)
+        if GITLINK_MODE in (old_mode, new_mode):
+            logger.info(f"Submodule changed since {base_ref}: {path}")
+
+    logger.info(f"Found {len(changed_paths)} changed paths since {base_ref}")
+    return changed_paths
+
+def find_library_dirs(parent_dirs):
+    """List the library directories (immediate subdirectories) of each parent directory."""
+    library_dirs = []
+    for parent_dir in parent_dirs:
+        for item in sorted(os.listdir(parent_dir)):
+            item_path = os.path.join(parent_dir, item)
+            if os.path.isdir(item_path):
+                library_dirs.append(item_path)
+    return library_dirs
+
+def is_path_in_library(path, library_rel_path):
+    """Check whether a changed path touches a library directory.
+
+    A path touches the library if it lies inside it, or if it is an ancestor
+    of it (e.g. a gitlink for a submodule that contains the whole library).
+    """
+    path = path.rstrip('/')
+    return (path == library_rel_path or
+            path.startswith(library_rel_path + '/') or
+            library_rel_path.startswith(path + '/'))
+
+def has_source_files(library_dir):
+    """Check whether a library directory contains any C/C++ files."""
+    for _, _, files in os.walk(library_dir):
+        if any(Path(f).suffix in SOURCE_EXTENSIONS for f in files):
+            return True
+    return False
+
+def has_reusable_base_results(base_artifacts_dir, library_rel_path, library_dir):
+    """Check whether the base artifacts hold complete results for the library.
+
+    A library with C/C++ files is only reusable if its base OSV response
+    exists, so one that failed on the base commit (e.g. a transient API
+    error) is retried instead of staying in the failed list.
+    """
+    name = os.path.basename(library_rel_path)
+    base_library_dir = os.path.join(base_artifacts_dir, library_rel_path)
+    if os.path.exists(os.path.join(base_library_dir, f"{name}_osv_response.json")):
+        return True
+    if has_source_files(library_dir):
+        return False
+    return any(os.path.exists(os.path.join(base_library_dir, f"{name}{suffix}"))
+               for suffix in RESULT_FILE_SUFFIXES)
+
+def select_libraries_to_scan(root_dir, library_dirs, base_ref, base_artifacts_dir):
+    """Split library directories into those that need a rescan and those that can be reused.
+
+    Returns a tuple of (rescan_dirs, reuse_dirs), or None if the changed paths
+    could not be determined and a full scan is needed.
+    """
+    changed_paths = get_changed_paths(root_dir, base_ref)
+    if changed_paths is None:
+        return None
+
+    rescan_dirs = []
+    reuse_dirs = []
+    for library_dir in library_dirs:
+        library_rel_path = os.path.relpath(library_dir, root_dir).replace(os.sep, '/')
+        if any(is_path_in_library(path, library_rel_path) for path in changed_paths):
+            logger.info(f"Library changed since {base_ref}: {library_rel_path}")
+            rescan_dirs.append(library_dir)
+        elif not has_reusable_base_results(base_artifacts_dir, library_rel_path, library_dir):
+            logger.info(f"No complete base results for {library_rel_path}, rescanning")
+            rescan_dirs.append(library_dir)
+        else:
+            reuse_dirs.append(library_dir)
+
+    logger.info(f"{len(rescan_dirs)} libraries to rescan, {len(reuse_dirs)} reused from {base_ref}")
+    return rescan_dirs, reuse_dirs
+
+def restore_base_results(root_dir, library_dirs, base_artifacts_dir):
+    """Copy the base commit's result files for the given libraries into the tree."""
+    for library_dir in library_dirs:
+        library_rel_path = os.path.relpath(library_dir, root_dir)
+        name = os.path.basename(library_rel_path)
+        for suffix in RESULT_FILE_SUFFIXES:
+            base_file = os.path.join(base_artifacts_dir, library_rel_path, f"{name}{suffix}")
+            if os.path.exists(base_file):
+                shutil.copy2(base_file, os.path.join(library_dir, f"{name}{suffix}"))
+                logger.debug(f"Restored {base_file}")
+
+def main():
+    parser = argparse.ArgumentParser(description='List the library directories changed since a base Git ref.')
+    parser.add_argument('root_dir', help='Directory containing the library directories')
+    parser.add_argument('--since', required=True, help='Base Git ref to compare HEAD against')
+    parser.add_argument('--base-artifacts', required=True,
+                       help="Directory holding the base commit's stored result files")
+    parser.add_argument('--log-level', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                       default='INFO', help='Set the logging level')
+    args = parser.parse_args()
+
+    # Set logging level
+    logger.setLevel(getattr(logging, args.log_level))
+
+    selection = select_libraries_to_scan(args.root_dir, find_library_dirs([args.root_dir]),
+                                         args.since, args.base_artifacts)
+    if selection is None:
+        return
+
+    for library_dir in selection[0]:
+        print(library_dir)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,601 @@
+import os
+import re
+import ast
+import bisect
+import hashlib
+import json
+import argparse
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Bump when the parse result format changes so stale cache entries are ignored
+PARSER_VERSION = 2
+
+CMAKE_MANIFESTS = {'CMakeLists.txt'}
+VCPKG_MANIFESTS = {'vcpkg.json'}
+CONAN_MANIFESTS = {'conanfile.txt', 'conanfile.py'}
+
+# Directories skipped during discovery, like the find filters in the workflows
+SKIPPED_DIRS = {'build'}
+
+# CMake commands that declare dependencies
+DEPENDENCY_COMMANDS = {
+    'find_package',
+    'pkg_check_modules',
+    'pkg_search_module',
+    'fetchcontent_declare',
+    'externalproject_add',
+    'find_library',
+    'find_path',
+    'find_program',
+    'find_file'
+}
+
+# One regex alternative per CMake token; bracket forms must come before the
+# plain comment and unquoted argument forms they overlap with.
+CMAKE_TOKEN_RE = re.compile(r'''
+    (?P<bracket_comment>\#\[(?P<bc_eq>=*)\[.*?\](?P=bc_eq)\])
+  | (?P<line_comment>\#[^\n]*)
+  | (?P<bracket_arg>\[(?P<ba_eq>=*)\[.*?\](?P=ba_eq)\])
+  | (?P<quoted_arg>"(?:\\.|[^"\\])*")
+  | (?P<open>\()
+  | (?P<close>\))
+  | (?P<space>\s+)
+  | (?P<unquoted_arg>(?:\\.|[^\s()\#"\\])+)
+''', re.VERBOSE | re.DOTALL)
+
+PKG_CONFIG_KEYWORDS = {
+    'REQUIRED', 'QUIET', 'NO_CMAKE_PATH', 'NO_CMAKE_ENVIRONMENT_PATH',
+    'IMPORTED_TARGET', 'GLOBAL'
+}
+
+FIND_COMMAND_KEYWORDS = {
+    'NAMES', 'NAMES_PER_DIR', 'HINTS', 'PATHS', 'PATH_SUFFIXES', 'DOC',
+    'REQUIRED', 'NO_DEFAULT_PATH', 'NO_CACHE', 'VALIDATOR', 'ENV',
+    'NO_PACKAGE_ROOT_PATH', 'NO_CMAKE_PATH', 'NO_CMAKE_ENVIRONMENT_PATH',
+    'NO_SYSTEM_ENVIRONMENT_PATH', 'NO_CMAKE_SYSTEM_PATH',
+    'NO_CMAKE_INSTALL_PREFIX', 'CMAKE_FIND_ROOT_PATH_BOTH',
+    'ONLY_CMAKE_FIND_ROOT_PATH', 'NO_CMAKE_FIND_ROOT_PATH', 'REGISTRY_VIEW'
+}
+
+VERSION_RE = re.compile(r'^\d+(\.\d+)*')
+
+# Version fields a vcpkg override can pin
+VCPKG_VERSION_KEYS = ('version', 'version-semver', 'version-date', 'version-string')
+
+# Conan sections that go to [build_requires] rather than [requires]
+CONAN_BUILD_SECTIONS = {'tool_requires', 'build_requires'}
+
+def unquote_cmake_arg(kind, text):
+    """Return the value of a quoted or bracket argument token."""
+    if kind == 'bracket_arg':
+        eq_len = text.index('[', 1) - 1
+        value = text[eq_len + 2:-(eq_len + 2)]
+        # A newline right after the opening bracket is not part of the value
+        return value[1:] if value.startswith('\n') else value
+    value = text[1:-1]
+    value = value.replace('\\\n', '')
+    return re.sub(r'\\(.)', lambda m: {'n': '\n', 't': '\t', 'r': '\r'}.get(m.group(1), m.group(1)), value)
+
+def tokenize_cmake(content):
+    """Split CMake source into command invocations.
+
+    Returns a list of dicts with the command name as written, its arguments
+    and the line the command starts on. Comments are dropped, quoted and
+    bracket arguments are unescaped, and calls spanning several lines are
+    handled like any other.
+    """
+    line_starts = [0] + [m.end() for m in re.finditer('\n', content)]
+    commands = []
+    pending_name = None
+    current = None
+    depth = 0
+
+    for match in CMAKE_TOKEN_RE.finditer(content):
+        kind = match.lastgroup
+        text = match.group()
+        if kind in ('bracket_comment', 'line_comment'):
+            continue
+
+        if current is None:
+            if kind == 'space':
+                continue
+            if kind == 'open' and pending_name is not None:
+                current = {
+                    "command": pending_name[0],
+                    "args": [],
+                    "line": bisect.bisect_right(line_starts, pending_name[1])
+                }
+                depth = 1
+                pending_name = None
+            elif kind == 'unquoted_arg':
+                pending_name = (text, match.start())
+            else:
+                pending_name = None
+            continue
+
+        if kind == 'open':
+            depth += 1
+        elif kind == 'close':
+            depth -= 1
+            if depth == 0:
+                commands.append(current)
+                current = None
+        elif kind in ('quoted_arg', 'bracket_arg'):
+            current["args"].append(unquote_cmake_arg(kind, text))
+        elif kind == 'unquoted_arg':
+            current["args"].append(text)
+
+    return commands
+
+def split_module_spec(spec):
+    """Split a pkg-config module spec such as 'glib-2.0>=2.10' into name and version."""
+    match = re.match(r'^([^<>=]+)(?:[<>=]+(.+))?$', spec)
+    if not match:
+        return spec, None
+    return match.group(1), match.group(2)
+
+def get_keyword_value(args, keyword):
+    """Return the argument following a keyword, or None."""
+    if keyword in args:
+        index = args.index(keyword)
+        if index + 1 < len(args):
+            return args[index + 1]
+    return None
+
+def extract_cmake_dependencies(command):
+    """Turn one CMake command invocation into dependency entries."""
+    name = command["command"]
+    command_name = name.lower()
+    args = command["args"]
+    line = command["line"]
+    if not args:
+        return []
+
+    def dependency(dep_name, version=None, source=None):
+        return {
+            "command": name,
+            "name": dep_name,
+            "version": version,
+            "source": source,
+            "line": line
+        }
+
+    if command_name == 'find_package':
+        version = args[1] if len(args) > 1 and VERSION_RE.match(args[1]) else None
+        return [dependency(args[0], version)]
+
+    if command_name in ('pkg_check_modules', 'pkg_search_module'):
+        dependencies = []
+        for spec in args[1:]:
+            if spec in PKG_CONFIG_KEYWORDS:
+                continue
+            module, version = split_module_spec(spec)
+            dependencies.append(dependency(module, version))
+        return dependencies
+
+    if command_name in ('fetchcontent_declare', 'externalproject_add'):
+        source = get_keyword_value(args, 'GIT_REPOSITORY') or get_keyword_value(args, 'URL')
+        return [dependency(args[0], get_keyword_value(args, 'GIT_TAG'), source)]
+
+    # find_library, find_path, find_program and find_file
+    if len(args) < 2:
+        return []
+    if args[1] == 'NAMES':
+        names = []
+        for arg in args[2:]:
+            if arg in FIND_COMMAND_KEYWORDS:
+                break
+            names.append(arg)
+    else:
+        names = [args[1]]
+    return [dependency(find_name) for find_name in names]
+
+def parse_cmake_manifest(content):
+    """Parse a CMakeLists.txt into its dependency calls and dependencies."""
+    calls = []
+    dependencies = []
+    for command in tokenize_cmake(content):
+        # CMake command names are case-insensitive
+        if command["command"].lower() in DEPENDENCY_COMMANDS:
+            calls.append(command)
+            dependencies.extend(extract_cmake_dependencies(command))
+    return {"calls": calls, "dependencies": dependencies}
+
+def parse_vcpkg_manifest(content):
+    """Parse a vcpkg.json manifest into dependencies."""
+    data = json.loads(content)
+    if not isinstance(data, dict):
+        raise ValueError("vcpkg.json is not a JSON object")
+
+    overrides = {}
+    for override in data.get("overrides") or []:
+        if not isinstance(override, dict) or not isinstance(override.get("name"), str):
+            continue
+        version = next((override[key] for key in VCPKG_VERSION_KEYS if override.get(key)), None)
+        # An override without a version must not erase the dependency's own constraint
+        if version:
+            overrides[override["name"]] = version
+
+    dependencies = []
+    entries = data.get("dependencies") or []
+    if not isinstance(entries, list):
+        raise ValueError("vcpkg.json 'dependencies' is not a list")
+    for entry in entries:
+        if isinstance(entry, str):
+            name, version = entry, None
+        elif isinstance(entry, dict):
+            name, version = entry.get("name"), entry.get("version>=")
+        else:
+            continue
+        if not isinstance(name, str) or not name:
+            continue
+        dependencies.append({
+            "command": "vcpkg",
+            "name": name,
+            "version": overrides.get(name, version),
+            "source": None,
+            "line": None
+        })
+    return {"calls": [], "dependencies": dependencies}
+
+def split_conan_reference(reference):
+    """Split a Conan reference such as 'zlib/1.2.13@user/channel#rev' into name and version."""
+    reference = reference.split('#', 1)[0].split('@', 1)[0].strip()
+    name, _, version = reference.partition('/')
+    return name, version or None
+
+def conan_dependency(section, reference):
+    """Build a dependency entry for a Conan reference in the given section."""
+    name, version = split_conan_reference(reference)
+    return {
+        "command": f"conan {section}",
+        "name": name,
+        "version": version,
+        "source": None,
+        "line": None
+    }
+
+def parse_conanfile_txt(content):
+    """Parse the requirement sections of a conanfile.txt."""
+    dependencies = []
+    section = None
+    for raw_line in content.splitlines():
+        line = raw_line.split('#', 1)[0].strip()
+        if not line:
+            continue
+        if line.startswith('[') and line.endswith(']'):
+            section = line[1:-1]
+            continue
+        if section in ('requires', 'tool_requires', 'build_requires', 'test_requires'):
+            dependencies.append(conan_dependency(section, line))
+    return {"calls": [], "dependencies": dependencies}
+
+def parse_conanfile_py(content):
+    """Parse requirement attributes and self.requires() calls of a conanfile.py."""
+    sections = ('requires', 'tool_requires', 'build_requires', 'test_requires')
+    dependencies = []
+
+    def add_references(section, node):
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            for reference in node.value.split(','):
+                if reference.strip():
+                    dependencies.append(conan_dependency(section, reference))
+        elif isinstance(node, (ast.List, ast.Tuple)):
+            for element in node.elts:
+                # Old style entries may be (reference, "private") tuples
+                if isinstance(element, ast.Tuple) and element.elts:
+                    element = element.elts[0]
+                add_references(section, element)
+
+    for node in ast.walk(ast.parse(content)):
+        if isinstance(node, ast.Assign):
+            for target in node.targets:
+                if isinstance(target, ast.Name) and target.id in sections:
+                    add_references(target.id, node.value)
+        elif (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and
+              node.func.attr in sections and node.args):
+            add_references(node.func.attr, node.args[0])
+
+    return {"calls": [], "dependencies": dependencies}
+
+def parse_manifest_content(file_name, content):
+    """Dispatch manifest content to the parser for its file name."""
+    if file_name in CMAKE_MANIFESTS:
+        return parse_cmake_manifest(content)
+    if file_name in VCPKG_MANIFESTS:
+        return parse_vcpkg_manifest(content)
+    if file_name == 'conanfile.txt':
+        return parse_conanfile_txt(content)
+    return parse_conanfile_py(content)
+
+def find_manifest_files(root_dir):
+    """Walk the tree once and collect all manifest files, skipping hidden and build directories."""
+    manifest_names = CMAKE_MANIFESTS | VCPKG_MANIFESTS | CONAN_MANIFESTS
+    manifest_files = []
+    for root, dirs, files in os.walk(root_dir):
+        dirs[:] = sorted(d for d in dirs if not d.startswith('.') and d not in SKIPPED_DIRS)
+        for file in sorted(files):
+            if file in manifest_names:
+                manifest_files.append(os.path.join(root, file))
+    return manifest_files
+
+_cached_keys = frozenset()
+
+def _init_worker(cached_keys):
+    global _cached_keys
+    _cached_keys = cached_keys
+
+def parse_manifest_file(file_path):
+    """Read a manifest once, hash it and parse it unless it is already cached.
+
+    The cache key combines the file name, which selects the parser, with the
+    content hash. Returns a tuple of (file_path, cache_key, result); result
+    is None when the cached entry should be used.
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            data = f.read()
+    except OSError as e:
+        logger.error(f"Error reading {file_path}: {str(e)}")
+        return file_path, None, None
+
+    file_name = os.path.basename(file_path)
+    cache_key = f"{file_name}:{hashlib.sha256(data).hexdigest()}"
+    if cache_key in _cached_keys:
+        return file_path, cache_key, None
+
+    try:
+        result = parse_manifest_content(file_name, data.decode('utf-8', errors='replace'))
+    except Exception as e:
+        # One broken manifest must not abort the whole run
+        logger.error(f"Error parsing {file_path}: {str(e)}")
+        result = {"calls": [], "dependencies": [], "error": str(e)}
+    return file_path, cache_key, result
+
+def load_cache(cache_file):
+    """Load the parse cache, keyed by file name and content hash."""
+    if not cache_file or not os.path.exists(cache_file):
+        return {}
+    try:
+        with open(cache_file, 'r') as f:
+            cache = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable manifest cache {cache_file}: {str(e)}")
+        return {}
+    if cache.get("parser_version") != PARSER_VERSION:
+        logger.info("Manifest cache was written by another parser version, ignoring it")
+        return {}
+    return cache.get("entries", {})
+
+def save_cache(cache_file, entries):
+    """Save the parse cache."""
+    cache_dir = os.path.dirname(os.path.abspath(cache_file))
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(cache_file, 'w') as f:
+        json.dump({"parser_version": PARSER_VERSION, "entries": entries}, f)
+
+def parse_manifests(root_dir, cache_file=None, jobs=None):
+    """Parse every manifest under root_dir in parallel, reusing cached results.
+
+    Returns a list of dicts with the manifest path (relative to root_dir) and
+    its parse result, sorted by path.
+    """
+    manifest_files = find_manifest_files(root_dir)
+    cache = load_cache(cache_file)
+    logger.info(f"Found {len(manifest_files)} manifest files, {len(cache)} cached parse results")
+
+    manifests = []
+    used_entries = {}
+    parsed = 0
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(frozenset(cache),)) as executor:
+        for file_path, cache_key, result in executor.map(parse_manifest_file, manifest_files, chunksize=32):
+            if cache_key is None:
+                continue
+            if result is None:
+                result = cache[cache_key]
+            else:
+                parsed += 1
+            used_entries[cache_key] = result
+            manifests.append({
+                "path": os.path.relpath(file_path, root_dir),
+                "file_name": os.path.basename(file_path),
+                **result
+            })
+
+    logger.info(f"Parsed {parsed} manifest files, reused {len(manifests) - parsed} from cache")
+    if cache_file:
+        # Only keep entries for manifests that still exist so the cache does not grow forever
+        save_cache(cache_file, used_entries)
+    return manifests
+
+def format_dependency(dependency):
+    """Format a dependency like the workflows' summaries, e.g. 'ZLIB:1.2'."""
+    detail = dependency["version"] or dependency["source"]
+    return f"{dependency['name']}:{detail}" if detail else dependency["name"]
+
+def generate_markdown_sections(manifests):
+    """Build the report sections for the parsed manifests."""
+    cmake_manifests = [m for m in manifests if m["file_name"] in CMAKE_MANIFESTS]
+    package_manifests = [m for m in manifests if m["file_name"] not in CMAKE_MANIFESTS]
+
+    markdown = ["", "## CMake Dependencies"]
+    if cmake_manifests:
+        markdown.append("### Direct CMake Dependencies")
+        markdown.append("```")
+        for manifest in cmake_manifests:
+            if not manifest["calls"]:
+                continue
+            markdown.append(f"File: {manifest['path']}")
+            for call in manifest["calls"]:
+                markdown.append(f"{call['line']}: {call['command']}({' '.join(call['args'])})")
+            markdown.append("")
+        markdown.append("```")
+
+        markdown.append("")
+        markdown.append("### Summary of Unique Dependencies")
+        markdown.append("```")
+        summary = {format_dependency(d) for m in cmake_manifests for d in m["dependencies"]}
+        markdown.extend(sorted(summary))
+        markdown.append("```")
+    else:
+        markdown.append("No CMakeLists.txt files found in the project.")
+
+    if package_manifests:
+        markdown.append("")
+        markdown.append("## Package Manager Manifests")
+        markdown.append("| Manifest | Section | Package | Version |")
+        markdown.append("|----------|---------|---------|---------|")
+        for manifest in package_manifests:
+            if manifest.get("error"):
+                markdown.append(f"| {manifest['path']} | parse error | {manifest['error']} | |")
+            for dependency in manifest["dependencies"]:
+                markdown.append(
+                    f"| {manifest['path']} | {dependency['command']} | {dependency['name']} | "
+                    f"{dependency['version'] or 'N/A'} |"
+                )
+
+    return markdown
+
+def read_conanfile_packages(conanfile):
+    """Map each section of an existing conanfile.txt to the package names it already lists."""
+    packages = {}
+    section = None
+    if not conanfile or not os.path.exists(conanfile):
+        return packages
+    with open(conanfile, 'r') as f:
+        for raw_line in f:
+            line = raw_line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            if line.startswith('[') and line.endswith(']'):
+                section = line[1:-1]
+                continue
+            name, _ = split_conan_reference(line)
+            packages.setdefault(section, set()).add(name.lower())
+    return packages
+
+def cmake_conan_version(dependency):
+    """Translate the version of a CMake dependency into a Conan version, or None to skip it.
+
+    find_package versions are minimums, so they become ranges; FetchContent
+    and ExternalProject tags are only used when they name a release, not a
+    commit or branch. pkg-config module names are not Conan package names.
+    """
+    version = dependency["version"]
+    command_name = dependency["command"].lower()
+    if not version or command_name in ('pkg_check_modules', 'pkg_search_module'):
+        return None
+    if command_name == 'find_package':
+        return f"[>={version}]" if VERSION_RE.fullmatch(version) else None
+    version = version.lstrip('v')
+    return version if VERSION_RE.fullmatch(version) else None
+
+def generate_conanfile_lines(manifests, section='requires', existing_packages=None):
+    """Build conanfile lines for one section from the manifest dependencies.
+
+    section is 'requires' or 'build_requires'; Conan tool_requires and
+    build_requires go to the latter, everything else that pins a version to
+    the former (test_requires are left out). Each package appears once:
+    Conan manifests win over vcpkg, which wins over CMake, and packages in
+    existing_packages (e.g. already written by the workflow) are skipped.
+    """
+    sources = [
+        ("# Conan Dependencies", CONAN_MANIFESTS),
+        ("# vcpkg Dependencies", VCPKG_MANIFESTS),
+        ("# CMake Manifest Dependencies", CMAKE_MANIFESTS)
+    ]
+    seen = set(existing_packages or ())
+    lines = []
+    for header, file_names in sources:
+        section_lines = []
+        for manifest in manifests:
+            if manifest["file_name"] not in file_names:
+                continue
+            for dependency in manifest["dependencies"]:
+                command = dependency["command"]
+                if command.startswith('conan '):
+                    conan_section = command.split(' ', 1)[1]
+                    if conan_section == 'test_requires':
+                        continue
+                    target = 'build_requires' if conan_section in CONAN_BUILD_SECTIONS else 'requires'
+                else:
+                    target = 'requires'
+                if target != section:
+                    continue
+
+                version = dependency["version"]
+                if manifest["file_name"] in CMAKE_MANIFESTS:
+                    version = cmake_conan_version(dependency)
+                    if not version:
+                        continue
+                name = dependency["name"].lower()
+                if name in seen:
+                    continue
+                seen.add(name)
+                section_lines.append(f"{name}/{version or 'latest'} # From {command} in {manifest['path']}")
+        if section_lines:
+            lines.append("")
+            lines.append(header)
+            lines.extend(section_lines)
+    return lines
+
+def main():
+    parser = argparse.ArgumentParser(description='Parse CMake, vcpkg and Conan manifests for dependency information.')
+    parser.add_argument('root_dir', nargs='?', default='.', help='Root directory to search for manifests')
+    parser.add_argument('--report', help='Markdown report file to append the dependency sections to')
+    parser.add_argument('--conanfile', help='conanfile.txt to append requirement lines to')
+    parser.add_argument('--section', choices=['requires', 'build_requires'], default='requires',
+                       help='Which conanfile section is being appended to')
+    parser.add_argument('--json-output', help='Write the parsed manifests to this JSON file')
+    parser.add_argument('--from-json', help='Read manifests previously written with --json-output instead of scanning')
+    parser.add_argument('--cache', help='Cache file for parse results keyed by file name and hash')
+    parser.add_argument('--jobs', type=int, default=None, help='Number of parallel parser processes')
+    parser.add_argument('--log-level', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                       default='INFO', help='Set the logging level')
+    args = parser.parse_args()
+
+    # Set logging level
+    logger.setLevel(getattr(logging, args.log_level))
+
+    if args.from_json:
+        with open(args.from_json, 'r') as f:
+            manifests = json.load(f)
+        logger.info(f"Loaded {len(manifests)} parsed manifests from: {os.path.abspath(args.from_json)}")
+    else:
+        manifests = parse_manifests(args.root_dir, args.cache, args.jobs)
+
+    if args.json_output:
+        with open(args.json_output, 'w') as f:
+            json.dump(manifests, f, indent=2)
+        logger.info(f"Parsed manifests saved to: {os.path.abspath(args.json_output)}")
+
+    if args.report:
+        with open(args.report, 'a') as f:
+            f.write('\n'.join(generate_markdown_sections(manifests)) + '\n')
+        logger.info(f"Manifest dependencies added to report: {os.path.abspath(args.report)}")
+
+    if args.conanfile:
+        # Skip packages the conanfile already lists in this section so pins never conflict
+        existing = read_conanfile_packages(args.conanfile)
+        if args.section == 'build_requires':
+            existing_packages = existing.get('build_requires', set()) | existing.get('tool_requires', set())
+        else:
+            existing_packages = existing.get('requires', set())
+        with open(args.conanfile, 'a') as f:
+            f.write('\n'.join(generate_conanfile_lines(manifests, args.section, existing_packages)) + '\n')
+        logger.info(f"Manifest dependencies added to conanfile: {os.path.abspath(args.conanfile)}")
+
+    if not args.report and not args.conanfile and not args.json_output:
+        print('\n'.join(generate_markdown_sections(manifests)))
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ import argparse
 import logging
 from hash_files import process_directory
 from git_submodule_version import process_directory_with_git
+from git_discovery import discover_git_repositories
 
 # Configure logging
 logging.basicConfig(
@@ -11,29 +12,38 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def process_all_directories(root_dir, debug=False):
+def process_library_directory(item_path, debug=False, adaptive=False, discovery=None):
+    """Run Git submodule and file hashing version detection for one library directory."""
+    item = os.path.basename(os.path.normpath(item_path))
+    logger.info(f"\nProcessing directory: {item}")
+    
+    # Try Git submodule version detection first
+    git_info = process_directory_with_git(item_path, debug, discovery)
+    
+    # Always try file hashing version detection
+    logger.info(f"\nAttempting file hashing version detection for: {item}")
+    hash_info = process_directory(item_path, debug, adaptive)
+    
+    if hash_info:
+        logger.info(f"Found version information using file hashing for: {item}")
+    else:
+        logger.info(f"No version information found using file hashing for: {item}")
+
+def process_all_directories(root_dir, debug=False, adaptive=False, discovery=None):
     """Process all subdirectories in the root directory."""
     if not os.path.isdir(root_dir):
         logger.error(f"Error: {root_dir} is not a valid directory")
         return
     
+    # Map repositories and submodules once instead of running git per directory
+    if discovery is None:
+        discovery = discover_git_repositories(root_dir)
+    
     # Process each subdirectory
     for item in os.listdir(root_dir):
         item_path = os.path.join(root_dir, item)
         if os.path.isdir(item_path):
-            logger.info(f"\nProcessing directory: {item}")
-            
-            # Try Git submodule version detection first
-            git_info = process_directory_with_git(item_path, debug)
-            
-            # Always try file hashing version detection
-            logger.info(f"\nAttempting file hashing version detection for: {item}")
-            hash_info = process_directory(item_path, debug)
-            
-            if hash_info:
-                logger.info(f"Found version information using file hashing for: {item}")
-            else:
-                logger.info(f"No version information found using file hashing for: {item}")
+            process_library_directory(item_path, debug, adaptive, discovery)
 
 def main():
     parser = argparse.ArgumentParser(description='Process all subdirectories to find library versions.')
@@ -41,12 +51,14 @@ def main():
     parser.add_argument('--debug', action='store_true', help='Enable debug mode (saves Git info to JSON files)')
     parser.add_argument('--log-level', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'], 
                        default='INFO', help='Set the logging level')
+    parser.add_argument('--adaptive', action='store_true',
+                       help='Use adaptive sampled hashing for file hashing version detection')
     args = parser.parse_args()
     
     # Set logging level
     logger.setLevel(getattr(logging, args.log_level))
     
-    process_all_directories(args.root_dir, args.debug)
+    process_all_directories(args.root_dir, args.debug, args.adaptive)
 
 if __name__ == "__main__":
     main() 